@@ -17,15 +17,264 @@ import asyncio
 import ssl
 import websockets
 import requests
+from requests.adapters import HTTPAdapter
 import socks
 import socket
-from contextlib import asynccontextmanager
+from collections.abc import Awaitable, Callable
+from functools import lru_cache, partial
+from time import monotonic, sleep
 import json
-from string import Template
+import itertools
+import weakref
 import logging
+from urllib.parse import urlsplit
 from .injectorcommands.injectorcommands import InjectorCommands
 assert sys.version_info >= (3, 11)
 
+# Use orjson for deserializing CDP responses if it's installed
+# Both accept str and bytes
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Use uvloop for the event loop if it's installed
+# uvloop isn't available on Windows, which keeps asyncio's default loop
+try:
+    import uvloop
+    _new_event_loop = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
+
+# CDP methods of the built in commands, looked up once
+_CMD_TAB_COOKIES        = InjectorCommands.get_command("tab_cookies")[0]
+_CMD_ALL_COOKIES        = InjectorCommands.get_command("all_cookies")[0]
+_CMD_JS_EXEC            = InjectorCommands.get_command("js_exec")[0]
+_CMD_GET_DOMAIN_COOKIES = InjectorCommands.get_command("get_domain_cookies")[0]
+_CMD_CAPTURE_SCREENSHOT = InjectorCommands.get_command("capture_screenshot")[0]
+_CMD_NEW_WINDOW         = InjectorCommands.get_command("new_window")[0]
+_CMD_CLOSE_WINDOW       = InjectorCommands.get_command("close_window")[0]
+_CMD_GET_TAB_HISTORY    = InjectorCommands.get_command("get_tab_history")[0]
+
+# URL rewrites, compiled once instead of per request
+# Local ws URL to replace with custom_ws_target:custom_ws_port
+_WS_LOCAL_RE = re.compile(r'^ws://(?:localhost|127\.0\.0\.1)(?::\d+)?/')
+_HTTP_SCHEME_RE = re.compile(r'^http://')
+# websockets.connect options for pooled CDP connections.
+# CDP messages are small JSON, so skip permessage-deflate, and the event
+# loop only runs during calls, so keepalive pings would time out between them
+_WS_CONNECT_OPTIONS = dict(max_size=None, compression=None, ping_interval=None)
+
+
+@lru_cache(maxsize=256)
+def _compile_re(pattern: str, flags: int = 0) -> re.Pattern:
+    """Return compiled regex, cached so patterns reused
+    across calls are only compiled once
+
+    Keyword arguments:
+    pattern -- regex pattern string
+    flags -- re flags (default: 0)
+    """
+    return re.compile(pattern, flags)
+
+# Default regex for targets, matches every URL
+_MATCH_ALL = re.compile('.*')
+
+
+def _deep_getsizeof(obj: object) -> int:
+    """Return size in bytes of obj and everything it contains,
+    unlike sys.getsizeof which only measures obj itself.
+    Follows dicts, lists, tuples and sets, like decoded JSON
+
+    Keyword arguments:
+    obj -- object to measure
+    """
+    size = 0
+    seen = set()
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+    return size
+
+
+# Module logger for the functions below, the same logger ChromeInjector uses
+_log = logging.getLogger(__name__)
+
+
+# The per connection tasks and their cleanup are module level functions
+# over the pool dicts, not ChromeInjector methods. Tasks live as long as
+# their connection, and holding the ChromeInjector would keep it from
+# ever being garbage collected (and finalized)
+async def _ws_writer(ws_url: str,
+                     ws: websockets.WebSocketClientProtocol,
+                     send_queue: asyncio.Queue,
+                     sent_ids: set,
+                     drop_ws: Callable) -> None:
+    """Send queued requests over ws, in order queued, adding the
+    request ID of each one sent to sent_ids. Runs for as long as ws is pooled
+
+    Keyword arguments:
+    ws_url -- websocket URL
+    ws -- websocket connection
+    send_queue -- queue of tuples of (request ID, JSON request, future of response)
+    sent_ids -- set of request IDs written to their connection
+    drop_ws -- ChromeInjector's _drop_ws
+    """
+    try:
+        while True:
+            request_id, cdp_arb, future = await send_queue.get()
+            # Caller already gave up (timeout), don't bother sending
+            if future.done():
+                continue
+            await ws.send(cdp_arb)
+            sent_ids.add(request_id)
+    except websockets.ConnectionClosed as cc:
+        # Waiting callers log the failure themselves
+        _log.debug("Connection to %s closed: %s", ws_url, cc)
+        drop_ws(ws_url, ws, cc)
+    except Exception as e:
+        _log.error("Sending over %s failed: %s", ws_url, e)
+        drop_ws(ws_url, ws, e)
+        await ws.close()
+
+
+async def _ws_reader(ws_url: str,
+                     ws: websockets.WebSocketClientProtocol,
+                     pending: dict,
+                     drop_ws: Callable) -> None:
+    """Resolve futures of pending requests with the responses
+    received over ws. Runs for as long as ws is pooled
+
+    Keyword arguments:
+    ws_url -- websocket URL
+    ws -- websocket connection
+    pending -- dict of tuples of (connection, future of response) keyed by request ID
+    drop_ws -- ChromeInjector's _drop_ws
+    """
+    try:
+        while True:
+            json_msg = _loads(await ws.recv())
+            pending_request = pending.get(json_msg.get("id"))
+            # CDP events, or responses to requests that timed out
+            if pending_request is None:
+                _log.debug("Skipping message for ID: %s", json_msg.get('id'))
+                continue
+            __, future = pending_request
+            if not future.done():
+                future.set_result(json_msg)
+    except websockets.ConnectionClosed as cc:
+        # Waiting callers log the failure themselves
+        _log.debug("Connection to %s closed: %s", ws_url, cc)
+        drop_ws(ws_url, ws, cc)
+    except Exception as e:
+        # E.g. a message that isn't JSON. Don't leave ws pooled
+        # without a reader, later requests would never be answered
+        _log.error("Reading from %s failed: %s", ws_url, e)
+        drop_ws(ws_url, ws, e)
+        await ws.close()
+
+
+def _drop_ws(ws_pool: dict,
+             ws_queues: dict,
+             ws_locks: dict,
+             ws_tasks: dict,
+             pending: dict,
+             ws_url: str,
+             ws: websockets.WebSocketClientProtocol,
+             exc: Exception) -> None:
+    """Remove ws and its lock from the pool, stop its writer and
+    reader tasks, and fail the futures of requests still waiting on it.
+    Bound to a ChromeInjector's pool dicts as its _drop_ws
+
+    Keyword arguments:
+    ws_pool -- dict of websocket connections keyed by ws_url
+    ws_queues -- dict of send queues keyed by ws_url
+    ws_locks -- dict of locks guarding connecting keyed by ws_url
+    ws_tasks -- dict of tuples of (writer, reader) tasks keyed by ws_url
+    pending -- dict of tuples of (connection, future of response) keyed by request ID
+    ws_url -- websocket URL
+    ws -- websocket connection
+    exc -- exception to fail waiting requests with
+    """
+    # Already replaced or dropped
+    if ws_pool.get(ws_url) is not ws:
+        return
+    del ws_pool[ws_url]
+    del ws_queues[ws_url]
+    # Kept while held, _pooled_ws is connecting under it
+    lock = ws_locks.get(ws_url)
+    if lock is not None and not lock.locked():
+        del ws_locks[ws_url]
+    current_task = asyncio.current_task()
+    for task in ws_tasks.pop(ws_url):
+        if task is not current_task:
+            task.cancel()
+    for pending_ws, future in pending.values():
+        if pending_ws is ws and not future.done():
+            future.set_exception(exc)
+
+
+async def _close_ws_pool(ws_pool: dict, ws_tasks: dict) -> None:
+    """Stop every pooled websocket connection's writer
+    and reader tasks, then close the connections
+
+    Keyword arguments:
+    ws_pool -- dict of websocket connections keyed by ws_url
+    ws_tasks -- dict of tuples of (writer, reader) tasks keyed by ws_url
+    """
+    pool = list(ws_pool.values())
+    tasks = [task for connection_tasks in ws_tasks.values() for task in connection_tasks]
+    ws_pool.clear()
+    ws_tasks.clear()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    _log.debug("Initiating close of %d websocket(s)", len(pool))
+    await asyncio.gather(*(ws.close() for ws in pool), return_exceptions=True)
+
+
+def _close_injector(loop: asyncio.AbstractEventLoop,
+                    ws_pool: dict,
+                    ws_tasks: dict,
+                    http: requests.Session) -> None:
+    """Close a ChromeInjector's pooled websocket connections, event loop
+    and HTTP(S) session. Takes them rather than the ChromeInjector,
+    so it can be the ChromeInjector's finalizer
+
+    Keyword arguments:
+    loop -- event loop of the ChromeInjector
+    ws_pool -- dict of websocket connections keyed by ws_url
+    ws_tasks -- dict of tuples of (writer, reader) tasks keyed by ws_url
+    http -- HTTP(S) session of the ChromeInjector
+    """
+    if loop.is_closed():
+        return
+    _log.info("Closing ChromeInjector")
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        loop.run_until_complete(_close_ws_pool(ws_pool, ws_tasks))
+    else:
+        # Collected while another event loop is running, which
+        # rules out running this one. Drop the connections outright
+        _log.warning("Closing ChromeInjector from a running event loop, aborting websocket(s)")
+        for ws in ws_pool.values():
+            ws.transport.abort()
+        ws_pool.clear()
+        ws_tasks.clear()
+    loop.close()
+    http.close()
+
 
 class ChromeInjector:
     """A class used to create ChromeInjector objects,
@@ -33,6 +282,18 @@ class ChromeInjector:
     via the Chrome Dev Protocol
     """
 
+    # Every instance attribute, set in __init__, and __weakref__
+    # so instances can still be weakly referenced.
+    # Update when adding new instance attributes
+    __slots__ = ('_host', '_port', '_default_time', '_default_sleep_time',
+                 '_default_max_response_size', '_logger', '_open_windows',
+                 '_open_windows_ts', '_open_windows_ttl', '_id_iter', '_loop',
+                 '_ws_pool', '_ws_locks', '_ws_queues', '_ws_tasks', '_pending', '_sent_ids', '_drop_ws',
+                 '_rewrite_host_header', '_custom_host_header',
+                 '_custom_ws_target', '_custom_ws_port', '_https', '_wss',
+                 '_browser_ws', '_safe_ssl', '_ssl_context', '_proxy_type',
+                 '_proxy_host', '_proxy_port', '_http', '_finalizer', '__weakref__')
+
     # Default timeout period in seconds
     DEFAULT_TIME = 30.0
     # Default sleep between requests period in seconds
@@ -40,6 +301,9 @@ class ChromeInjector:
     # Default max size of ws response
     # Currently not using this
     DEFAULT_MAX_RESPONSE_SIZE = 256
+    # Default period in seconds enumerated windows are reused
+    # before re-enumerating
+    DEFAULT_OPEN_WINDOWS_TTL = 0.5
 
     def __init__ (self, host: str = "127.0.0.1",
                     port: int = 9222,
@@ -81,8 +345,32 @@ class ChromeInjector:
         # Windows are dicts including 'devtoolsFrontendURL, 'url',
         # and others as keys
         self._open_windows = None
-        # ID incrementor
-        self._id = 0
+        # When windows were last enumerated (time.monotonic),
+        # and how long to reuse them for
+        self._open_windows_ts = float('-inf')
+        self._open_windows_ttl = self.DEFAULT_OPEN_WINDOWS_TTL
+        # ID incrementor, shared by every coroutine sending requests
+        self._id_iter = itertools.count()
+        # Long lived event loop every CDP execution runs on,
+        # so pooled websockets stay usable between calls
+        self._loop = _new_event_loop()
+        # Open websocket connections keyed by ws_url, the locks
+        # guarding connecting to each of them, and each connection's
+        # send queue and (writer, reader) tasks
+        self._ws_pool = {}
+        self._ws_locks = {}
+        self._ws_queues = {}
+        self._ws_tasks = {}
+        # Requests awaiting a response, keyed by request ID,
+        # as tuples of (connection, future of response)
+        self._pending = {}
+        # IDs of pending requests the writer tasks have sent,
+        # so those aren't sent again if their connection closes
+        self._sent_ids = set()
+        # _drop_ws bound to the dicts above rather than to self,
+        # the connection tasks get it without holding self
+        self._drop_ws = partial(_drop_ws, self._ws_pool, self._ws_queues,
+                                self._ws_locks, self._ws_tasks, self._pending)
         # HOST Header Rewrites
         self._rewrite_host_header = rewrite_host_header
         self._custom_host_header = custom_host_header
@@ -99,18 +387,35 @@ class ChromeInjector:
         self._browser_ws = browser_ws
         # Use safe TLS/SSL
         self._safe_ssl = safe_ssl
+        # SSLContext for wss, built once and shared by every connection
+        if self._wss:
+            self._ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+            if not self._safe_ssl:
+                self._ssl_context.check_hostname = False
+                self._ssl_context.verify_mode = ssl.CERT_NONE
+        else:
+            self._ssl_context = None
         # Set Proxy options
         self._proxy_type = proxy_type
         self._proxy_host = proxy_host
         self._proxy_port = proxy_port
+        # HTTP(S) session, keeps connections to the CDP port alive between requests
+        self._http = requests.Session()
+        http_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self._http.mount("http://", http_adapter)
+        self._http.mount("https://", http_adapter)
+        # Close the loop, connections and session if close() isn't called,
+        # once this ChromeInjector is garbage collected or python exits
+        self._finalizer = weakref.finalize(self, _close_injector, self._loop,
+                                           self._ws_pool, self._ws_tasks, self._http)
 
         self._logger.info("Created new ChromeInjector")
-        self._logger.debug(f"Created new ChromeInjector with host: {host} and port: {port}")
+        self._logger.debug("Created new ChromeInjector with host: %s and port: %s", host, port)
         if (
             not (("localhost" in self._host) or
             ("127.0.0.1" in self._host))
             and not custom_ws_target):
-            self._logger.warning(f"Custom WS Target not set," +
+            self._logger.warning("Custom WS Target not set," +
                                     "but not using localhost or 127.0.0.1 as target")
         if custom_ws_target and not custom_ws_port:
             self._logger.warning("Custom target set but not custom port")
@@ -126,7 +431,7 @@ class ChromeInjector:
             self._logger.warning("Not validating TLS/SSL certificates")
 
         if self._proxy_type and self._proxy_port and self._proxy_host:
-            self._logger.info(f"Using {self._proxy_type} proxy at {self._proxy_host}:{self._proxy_port}")
+            self._logger.info("Using %s proxy at %s:%s", self._proxy_type, self._proxy_host, self._proxy_port)
 
 
     def get_browser_ws(self) -> str:
@@ -145,42 +450,110 @@ class ChromeInjector:
         """
         if browser_ws:
             self._logger.info('Setting browser_ws')
-            self._logger.debug(f'Setting browser_ws to: {browser_ws}')
+            self._logger.debug('Setting browser_ws to: %s', browser_ws)
             self._browser_ws = browser_ws
             return
         url = "http://"+self._host+":"+str(self._port)+"/json/version"
         if self._https:
             old_http_url = url
-            url = re.sub('^http://','https://',old_http_url)
+            url = _HTTP_SCHEME_RE.sub('https://', old_http_url)
             self._logger.info('Changed url to https')
-            self._logger.debug(f'Changed url {old_http_url} to {url}')
+            self._logger.debug('Changed url %s to %s', old_http_url, url)
         
         response = None
         if self._rewrite_host_header:
             self._logger.info("rewriting host header")
-            headers=f"'host':'{self._custom_host_header}'"
+            headers = {'host': self._custom_host_header}
         else:
             headers = None
 
         if self._proxy_type:
-            self._logger.info(f"Requesting ws URL with HTTP(S) through {self._proxy_type} proxy")
+            self._logger.info("Requesting ws URL with HTTP(S) through %s proxy", self._proxy_type)
             proxies=dict(http=f'{self._proxy_type}://@{self._proxy_host}:{self._proxy_port}',
                          https=f'{self._proxy_type}://@{self._proxy_host}:{self._proxy_port}')
         else:
             proxies=None
         
-        response = requests.get(url, headers=headers, proxies=proxies)
+        response = self._http.get(url, headers=headers, proxies=proxies, verify=self._safe_ssl)
         if response and response.ok:
             self._logger.info("Successfully connected")
-            self._logger.debug(f"Successfully connected to {url}")
-            self._browser_ws = response.json().get('webSocketDebuggerUrl')
-            self._logger.info(f"Browser WS: {self._browser_ws}")
+            self._logger.debug("Successfully connected to %s", url)
+            self._browser_ws = _loads(response.content).get('webSocketDebuggerUrl')
+            self._logger.info("Browser WS: %s", self._browser_ws)
         else:
             raise RuntimeError("Did not retrieve browser WS")
             
 
+    async def _aset_browser_ws(self) -> None:
+        """Retrieve and set browsers debug ws url (self._browser_ws).
+        The TCP connection for the browser debug ws is opened while
+        the url is being retrieved, then upgraded and pooled,
+        so the first CDP call against it doesn't wait on a handshake
+        """
+        # Proxied connections are made by the proxy, nothing to warm up
+        if self._proxy_type:
+            await asyncio.to_thread(self.set_browser_ws)
+            return
+        if self._custom_ws_target and self._custom_ws_port:
+            address = (self._custom_ws_target, int(self._custom_ws_port))
+        else:
+            address = (self._host, int(self._port))
+        self._logger.debug("Opening connection to %s:%s for browser ws", *address)
+        set_result, sock = await asyncio.gather(
+            asyncio.to_thread(self.set_browser_ws),
+            asyncio.to_thread(socket.create_connection, address, self._default_time),
+            return_exceptions=True)
+        # Any exception, e.g. UnicodeError for a host that isn't valid IDNA
+        if isinstance(sock, BaseException):
+            self._logger.warning("Could not open connection for browser ws: %s", sock)
+            sock = None
+        if isinstance(set_result, BaseException):
+            if sock:
+                sock.close()
+            raise set_result
+        # Nothing to warm up, or nothing to warm it up for
+        # if the browser ws wasn't retrieved
+        if sock is None or not self._browser_ws:
+            if sock:
+                sock.close()
+            return
+        # Only usable if the browser ws points at where we connected
+        ws_url = self._final_ws_url(self._browser_ws)
+        split_ws_url = urlsplit(ws_url)
+        if (split_ws_url.hostname, split_ws_url.port) != address:
+            self._logger.debug("Browser ws %s is not at %s:%s", ws_url, *address)
+            sock.close()
+            return
+        # Warming up is best effort, CDP calls connect on their own if it fails
+        try:
+            ws_url, ws, send_queue, reused = await self._pooled_ws(self._browser_ws, sock=sock)
+            if ws is not None:
+                self._logger.info("Connected to browser ws")
+        except Exception as e:
+            self._logger.warning("Could not connect to browser ws: %s", e)
+            sock.close()
+
+    def _ensure_browser_ws(self) -> str:
+        """Return browser debug ws url, enumerating it first if not set.
+        Returns None if it couldn't be enumerated
+        """
+        if not self._browser_ws:
+            self._logger.warning("Browser Debug WS not set, attempting" +
+                                 " to enumerate")
+            self._loop.run_until_complete(self._aset_browser_ws())
+            if not self._browser_ws:
+                self._logger.error("Could not enumerate browser WS")
+                return None
+        return self._browser_ws
+
     def _enum_windows(self) -> None:
-        """Set instance open windows."""
+        """Set instance open windows.
+        Skipped if windows were enumerated within self._open_windows_ttl
+        """
+        if (self._open_windows is not None and
+                monotonic() - self._open_windows_ts < self._open_windows_ttl):
+            self._logger.info("Windows recently enumerated, reusing them")
+            return
         # Construct url to query CDP browser WS
         # which will be used to enum windows
         self._logger.info("Attempting to enumerate open windows")
@@ -188,52 +561,48 @@ class ChromeInjector:
             if not self._browser_ws:
                 self._logger.info('No browser_ws set, ' +
                                     'using http(s) to enum browser ws')
-                self.set_browser_ws()
+                self._loop.run_until_complete(self._aset_browser_ws())
 
             # Attempt to enumerate open windows
             # If we got a response and the response is OK,
             # Go get windows over websocket
             self._logger.info("Attempting to enumerate open windows")
-            target_infos_dict = self._exec_cdp_params(self._browser_ws,
+            target_infos_dict = self._exec_cdp_noparams(self._browser_ws,
                                                         'Target.getTargets',
-                                                        None, None)
+                                                        None)
             target_infos = target_infos_dict['targetInfos']
             self._logger.info('Acquired targets')
-            self._logger.debug(f"Target Infos: {target_infos}")
+            self._logger.debug("Target Infos: %s", target_infos)
             self._open_windows = target_infos
-            self._logger.info(f"{len(self._open_windows)} potential target(s)")
+            self._open_windows_ts = monotonic()
+            self._logger.info("%s potential target(s)", len(self._open_windows))
         except Exception as e:
-            self._logger.error(f"Windows not enumerated: {e}")
+            self._logger.error("Windows not enumerated: %s", e)
 
-    def _enum_targets(self, regex: re.Pattern) -> list[dict]:
+    def _invalidate_windows(self) -> None:
+        """Make the next _enum_windows re-enumerate, e.g. after
+        opening or closing windows. Whatever the TTL, -inf is never within it
+        """
+        self._open_windows_ts = float('-inf')
+
+    def _enum_targets(self, regex: re.Pattern|str) -> list[dict]:
         """Return target windows, based on regex, from open windows.
         
         Keyword arguments:
-        regex -- compiled regex to filter URLs
+        regex -- compiled regex or pattern string to filter URLs
         """
         if regex is None:
-            self._logger.warning(f"No regex set for _enum_targets")
-        target_windows = []
+            self._logger.warning("No regex set for _enum_targets")
+        elif isinstance(regex, str):
+            regex = _compile_re(regex)
         if self._open_windows is None:
-            self._logger.error(f"No open windows enumerated. No targets to enum")
+            self._logger.error("No open windows enumerated. No targets to enum")
             return
-        # Iterate over open windows to create targets list based on regex
-        window_count = 0
-        for window in self._open_windows:
-            window_type = window.get("type")
-            # we only care about pages
-            if window_type != "page":
-                continue
-            # we only care about pages that match search regex
-            window_url = window.get("url")
-            if not regex.search(window_url):
-                continue
-            # We have now found a 'window' with url matching search regex
-            self._logger.info("Found tab matching regex")
-            self._logger.debug(f"Found tab with url: {window_url}")
-            target_windows.append(window)
-            window_count += 1
-        self._logger.info(f"There are {window_count} open window(s) that match target regex")
+        # We only care about pages that match search regex
+        search = regex.search
+        target_windows = [window for window in self._open_windows
+                          if window.get("type") == "page" and search(window.get("url") or "")]
+        self._logger.info("There are %s open window(s) that match target regex", len(target_windows))
         return target_windows
 
     def _get_url_ws_url (self, window: dict) -> tuple[str, str]:
@@ -246,6 +615,15 @@ class ChromeInjector:
         ws_url = self.generate_ws_url(window.get('targetId'))
         return url, ws_url
 
+    def _log_none(self, url: str) -> None:
+        """Log that url's result was None and return None
+
+        Keyword arguments:
+        url -- url of tab the result came from
+        """
+        self._logger.error("'%s' result was None", url)
+        return None
+
     def _get_result(self, response: dict) -> dict:
         """Return result of a CDP websocket response
 
@@ -261,185 +639,423 @@ class ChromeInjector:
                     self._logger.info("Response of size zero")
                     return None
                 else:
-                    self._logger.warning(f"Failed to retrieve result from response: {response}")
+                    self._logger.warning("Failed to retrieve result from response: %s", response)
                     return None
             except Exception as e:
-                self._logger.warning(f"Failed to retrieve result from response: {e}")
+                self._logger.warning("Failed to retrieve result from response: %s", e)
                 return None
         else:
             self._logger.warning("Response was None")
             return None
 
     async def _ws_send_wss(self, ws_url: str,
-                           cdp_method: str,
-                           cdp_params: dict,
-                           ws: str) -> dict:
-        """Execute CDP method and return dictionary of response
+                           cdp_arb: str,
+                           ws: websockets.WebSocketClientProtocol,
+                           send_queue: asyncio.Queue) -> dict:
+        """Execute CDP request and return dictionary of response
 
         Keyword arguments:
-        cdp_method -- CDP method to use
-        cdp_params -- dict of required and optional CDP params
-        ws -- websocket URL"""
+        ws_url -- websocket URL
+        cdp_arb -- JSON request with %d in place of the request ID,
+                   from InjectorCommands.paramless_template or params_template
+        ws -- websocket connection
+        send_queue -- send queue of ws's writer task
+
+        Raises websockets.ConnectionClosed if ws closed before the request was sent
+        """
+        request_id = next(self._id_iter)
+        cdp_arb = cdp_arb % request_id
+        # ws's reader task resolves the future once the response arrives
+        future = self._loop.create_future()
+        self._pending[request_id] = (ws, future)
         try:
-            # Execute with parameters
-            if cdp_params:
-                if type(cdp_params) is not dict:
-                    self._logger.error(f"cdp_params is not a dict. Returning None")
-                    return None
-                template, *__ = InjectorCommands.get_command_template("cdp_exec_params")
-                cdp_arb = template.substitute(id=self._id, method=cdp_method, params=json.dumps(cdp_params))
-                self._id += 1
-            # Execute without parameters
-            else:
-                template, *__ = InjectorCommands.get_command_template("cdp_exec")
-                cdp_arb = template.substitute(id=self._id, method=cdp_method)
-                self._id += 1
-            self._logger.info(f"Sending WS Request with ID: {str(self._id-1)}")
-            self._logger.debug(f"Sending:\n{cdp_arb}")            
-            await ws.send(cdp_arb)
-            msg = await ws.recv()
-            self._logger.info(f"WS Response received for request ID: {str(self._id-1)}")
-            self._logger.debug(f"WS Response:\n{msg}")
-            # Convert to dictionary and return
-            json_msg = json.loads(msg)
-            self._logger.debug(f"Initiating websocket close")
-            await ws.close()
+            self._logger.info("Sending WS Request with ID: %d", request_id)
+            self._logger.debug("Sending:\n%s", cdp_arb)
+            send_queue.put_nowait((request_id, cdp_arb, future))
+            json_msg = await future
+            self._logger.info("WS Response received for request ID: %d", request_id)
+            self._logger.debug("WS Response:\n%s", json_msg)
             return json_msg
         except websockets.ConnectionClosed as cc:
-            self._logger.error(f"Connection unexpectedly closed: {cc}")
+            # The browser may already be executing it,
+            # sending it again could execute it twice
+            if request_id in self._sent_ids:
+                self._logger.error("Connection to %s unexpectedly closed: %s", ws_url, cc)
+                return None
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+            self._sent_ids.discard(request_id)
 
-    @asynccontextmanager
-    async def _use_socks5_proxy(self, host: str, port: int):
-        """asynccontextmanager for making ws request over SOCKS5
+    async def _ws_send_batch(self, ws_url: str,
+                             ws: websockets.WebSocketClientProtocol,
+                             send_queue: asyncio.Queue,
+                             calls: list[tuple[str, dict]]) -> list[dict]:
+        """Execute CDP methods back-to-back over one websocket and
+        return list of dictionaries of responses, in order of calls
 
         Keyword arguments:
-        host -- target host for proxy
-        port -- target port for socks
+        ws_url -- websocket URL
+        ws -- websocket connection
+        send_queue -- send queue of ws's writer task
+        calls -- list of tuples of (CDP method, dict of CDP params or None)
+
+        Raises websockets.ConnectionClosed if ws closed before any request was sent
         """
-        # Store the original socket method
-        original_socket = socket.socket
-        
-        # Set up SOCKS proxy
-        # Should eventually lookup SOCKS5 (2) and set dynamically
-        self._logger.info(f"Setting socket to use {self._proxy_type} proxy ({self._proxy_host}:{self._proxy_port})")
-        socks.set_default_proxy(socks.SOCKS5, host, port)
-        socket.socket = socks.socksocket
-        
+        request_ids = [next(self._id_iter) for __ in calls]
+        futures = []
         try:
-            yield
+            self._logger.info("Sending %d WS Requests with IDs: %s", len(calls), request_ids)
+            for request_id, (cdp_method, cdp_params) in zip(request_ids, calls):
+                cdp_arb = InjectorCommands.build(request_id, cdp_method, cdp_params)
+                self._logger.debug("Sending:\n%s", cdp_arb)
+                future = self._loop.create_future()
+                self._pending[request_id] = (ws, future)
+                futures.append(future)
+                send_queue.put_nowait((request_id, cdp_arb, future))
+            # Futures are resolved in whatever order responses
+            # arrive, gather keeps them in order of calls
+            return await asyncio.gather(*futures)
+        except websockets.ConnectionClosed as cc:
+            # Part of the batch was already sent, sending
+            # it again could execute those CDP methods twice
+            if not self._sent_ids.isdisjoint(request_ids):
+                self._logger.error("Connection to %s unexpectedly closed: %s", ws_url, cc)
+                return None
+            raise
         finally:
-            # Restore the original socket method after exiting the context
-            socket.socket = original_socket
-            self._logger.info("Reset to original socket")
+            for request_id in request_ids:
+                self._pending.pop(request_id, None)
+                self._sent_ids.discard(request_id)
 
-    async def _cdp_ws_arb(self, ws_url: str,
-                          cdp_method: str,
-                          cdp_params: dict = None) -> dict:
-        """Wrapper for _ws_send_wss based on self._wss (TLS/SSL)
+    async def _socks5_connect(self, ws_url: str) -> socks.socksocket:
+        """Return socket connected to ws_url's host and port through SOCKS5 proxy.
+        The proxy is set on this socket only, not process wide
+
+        Keyword arguments:
+        ws_url -- websocket URL
+        """
+        split_ws_url = urlsplit(ws_url)
+        port = split_ws_url.port or (443 if split_ws_url.scheme == 'wss' else 80)
+        proxy_sock = socks.socksocket()
+        # Should eventually lookup SOCKS5 (2) and set dynamically
+        proxy_sock.set_proxy(socks.SOCKS5, self._proxy_host, int(self._proxy_port))
+        try:
+            # PySocks only connects blocking, keep it off the event loop
+            await asyncio.to_thread(proxy_sock.connect, (split_ws_url.hostname, port))
+        except BaseException:
+            proxy_sock.close()
+            raise
+        return proxy_sock
+
+    def _final_ws_url(self, ws_url: str) -> str:
+        """Return ws_url rewritten based on
+        self._custom_ws_target and self._wss (TLS/SSL)
 
         Keyword arguments:
         ws_url -- websocket URL
-        cdp_method -- CDP method to use
-        cdp_params -- dict of required and optional CDP params (default: None)
         """
         # Overwrite ws_url with custom_ws_target
-        if self._custom_ws_target and (self._custom_ws_target not in ws_url):
-            self._logger.info('Using custom WS')
-            self._logger.debug(f'Custom ws:{self._custom_ws_target}')
+        if (self._custom_ws_target and ws_url.startswith('ws://')
+                and (self._custom_ws_target not in ws_url)):
             old_ws_url = ws_url
-            ws_url = re.sub('^ws://(localhost|127.0.0.1)(:[0-9]{1,}){0,}/',
-                            f'ws://{self._custom_ws_target}:{self._custom_ws_port}/',
-                            old_ws_url)
-            self._logger.info('Changed WS to custom WS target')
-            self._logger.debug(f'Changed ws_url ({old_ws_url}) to '+
-                                f'custom_ws_target ({ws_url})')
-
-        # Connect to websocket and execute CDP method
-        # based on TLS/SSL or not
+            ws_url = _WS_LOCAL_RE.sub(f'ws://{self._custom_ws_target}:{self._custom_ws_port}/',
+                                      old_ws_url)
+            self._logger.debug('Changed ws_url (%s) to custom_ws_target (%s)',
+                               old_ws_url, ws_url)
+
+        # Use wss:// based on TLS/SSL or not
         if self._wss:
             old_ws_url = ws_url
-            if 'wss' not in old_ws_url:
-                ws_url = re.sub('^ws://', f'wss://', old_ws_url)
-                self._logger.info('Changed WS URL')
-                self._logger.debug(f'Changed {old_ws_url} to {ws_url}')
-            ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-            if not self._safe_ssl:
-                ssl_context.check_hostname = False
-                ssl_context.verify_mode = ssl.CERT_NONE
-        else:
-            ssl_context = None
+            if old_ws_url.startswith('ws://'):
+                ws_url = 'wss://' + old_ws_url[5:]
+                self._logger.debug('Changed WS URL %s to %s', old_ws_url, ws_url)
+        return ws_url
+
+    async def _pooled_ws(self, ws_url: str,
+                         sock: socket.socket = None) -> tuple[str, websockets.WebSocketClientProtocol, asyncio.Queue, bool]:
+        """Return tuple of (final ws_url, connection, send queue, reused) from the pool,
+        connecting and starting the connection's writer and reader tasks first if needed.
+        Connection and send queue are None if it couldn't be made.
+        reused is True if the connection was already pooled
+
+        Keyword arguments:
+        ws_url -- websocket URL
+        sock -- already connected socket to use if connecting (default: None)
+        """
+        ws_url = self._final_ws_url(ws_url)
+        # Only connecting needs the lock, requests are matched
+        # to responses by ID so callers can share the connection
+        lock = self._ws_locks.setdefault(ws_url, asyncio.Lock())
+        async with lock:
+            # Dropped (with its lock) while waiting on the lock,
+            # start over under the current lock
+            if self._ws_locks.get(ws_url) is not lock:
+                return await self._pooled_ws(ws_url, sock)
+            ws = self._ws_pool.get(ws_url)
+            reused = ws is not None
+            if ws is not None and ws.closed:
+                self._drop_ws(ws_url, ws, websockets.ConnectionClosed(ws.close_rcvd, ws.close_sent))
+                ws = None
+            if ws is None:
+                reused = False
+                ws = await self._ws_connect(ws_url, self._ssl_context, sock)
+                if ws is None:
+                    return ws_url, None, None, reused
+                send_queue = asyncio.Queue()
+                self._ws_pool[ws_url] = ws
+                self._ws_queues[ws_url] = send_queue
+                self._ws_tasks[ws_url] = (
+                    self._loop.create_task(_ws_writer(ws_url, ws, send_queue,
+                                                      self._sent_ids, self._drop_ws)),
+                    self._loop.create_task(_ws_reader(ws_url, ws, self._pending, self._drop_ws)))
+            else:
+                self._logger.debug("Reusing pooled connection to %s", ws_url)
+                if sock is not None:
+                    sock.close()
+            return ws_url, ws, self._ws_queues[ws_url], reused
+
+    async def _pooled_exchange(self, ws_url: str,
+                               exchange: Callable[..., Awaitable]) -> dict|list[dict]:
+        """Return result of awaiting exchange(final ws_url, connection, send queue)
+        over a pooled connection. If a reused connection turns out to be closed
+        before anything was sent, it's replaced and exchange is awaited once more
+
+        Keyword arguments:
+        ws_url -- websocket URL
+        exchange -- coroutine function sending requests and returning their responses
+        """
+        final_ws_url, ws, send_queue, reused = await self._pooled_ws(ws_url)
+        if ws is None:
+            return None
+        try:
+            return await exchange(final_ws_url, ws, send_queue)
+        except websockets.ConnectionClosed as cc:
+            if not reused:
+                self._logger.error("Connection to %s unexpectedly closed: %s", final_ws_url, cc)
+                return None
+            # No keepalive pings, so a connection the peer closed
+            # while idle (e.g. a tunnel timing out) is only noticed now
+            self._logger.info("Pooled connection to %s was closed, reconnecting", final_ws_url)
+            self._drop_ws(final_ws_url, ws, cc)
+        final_ws_url, ws, send_queue, reused = await self._pooled_ws(ws_url)
+        if ws is None:
+            return None
+        try:
+            return await exchange(final_ws_url, ws, send_queue)
+        except websockets.ConnectionClosed as cc:
+            self._logger.error("Connection to %s unexpectedly closed: %s", final_ws_url, cc)
+            return None
+
+    async def _cdp_ws_arb(self, ws_url: str, cdp_arb: str) -> dict:
+        """Wrapper for _ws_send_wss over a pooled connection
+
+        Keyword arguments:
+        ws_url -- websocket URL
+        cdp_arb -- JSON request with %d in place of the request ID
+        """
+        return await self._pooled_exchange(
+            ws_url, lambda ws_url, ws, send_queue:
+                self._ws_send_wss(ws_url, cdp_arb, ws, send_queue))
+
+    async def _cdp_ws_arb_batch(self, ws_url: str,
+                                calls: list[tuple[str, dict]]) -> list[dict]:
+        """Wrapper for _ws_send_batch over a pooled connection
+
+        Keyword arguments:
+        ws_url -- websocket URL
+        calls -- list of tuples of (CDP method, dict of CDP params or None)
+        """
+        return await self._pooled_exchange(
+            ws_url, lambda ws_url, ws, send_queue:
+                self._ws_send_batch(ws_url, ws, send_queue, calls))
+
+    async def _ws_connect(self, ws_url: str,
+                          ssl_context: ssl.SSLContext,
+                          sock: socket.socket = None) -> websockets.WebSocketClientProtocol:
+        """Return new websocket connection to ws_url, (not) using proxy
+
+        Keyword arguments:
+        ws_url -- websocket URL
+        ssl_context -- SSLContext for wss, or None
+        sock -- already connected socket to ws_url's host and port,
+                not used with proxy (default: None)
+        """
         if self._proxy_type:
             if self._proxy_type.upper() == 'SOCKS5':
-                self._logger.info(f"Making ws request through SOCKS5 proxy ({self._proxy_host}:{self._proxy_port})")
-                async with self._use_socks5_proxy(self._proxy_host, self._proxy_port):
-                    async for ws in websockets.connect(ws_url, ssl=ssl_context):
-                        return await self._ws_send_wss(ws_url, cdp_method, cdp_params, ws)
+                self._logger.info("Making ws request through SOCKS5 proxy (%s:%s)",
+                                  self._proxy_host, self._proxy_port)
+                sock = await self._socks5_connect(ws_url)
             #elif socks4
             #elif http  
             #elif wrong socks
             else:
-                self._logger.info(f"Proxy type: '{self._proxy_type}' not supported. Try socks5")
+                self._logger.info("Proxy type: '%s' not supported. Try socks5", self._proxy_type)
+                return None
+        elif sock is not None:
+            self._logger.debug("Proxy type not set, using already connected socket")
         else:
             self._logger.debug("Proxy type not set, not using proxy")
-            async for ws in websockets.connect(ws_url, ssl=ssl_context):
-                    return await self._ws_send_wss(ws_url, cdp_method, cdp_params, ws)
-            
-        
+            return await websockets.connect(ws_url, ssl=ssl_context, **_WS_CONNECT_OPTIONS)
+        # Already connected, websockets only needs to do TLS/SSL and the upgrade
+        if ssl_context:
+            return await websockets.connect(ws_url, ssl=ssl_context, sock=sock,
+                                            server_hostname=urlsplit(ws_url).hostname,
+                                            **_WS_CONNECT_OPTIONS)
+        return await websockets.connect(ws_url, sock=sock, **_WS_CONNECT_OPTIONS)
+
+    def close(self) -> None:
+        """Close pooled websocket connections and the event loop.
+        The ChromeInjector can't execute CDP methods afterwards.
+        Also done when the ChromeInjector is garbage collected or python exits
+        """
+        self._finalizer()
+
+    def __enter__(self) -> "ChromeInjector":
+        """Use ChromeInjector as a context manager, closing it on exit"""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close pooled connections and the event loop"""
+        self.close()
+
 
     async def _cdp_ws_arb_timeout(self, ws_url: str,
-                                  cdp_method: str,
-                                  cdp_params: str = None,
+                                  cdp_arb: str,
                                   time: int = None) -> dict:
         """Wrapper function for _cdp_ws_arb to add timeout
 
         Keyword arguments:
         ws_url --: websocket URL
-        cdp_method -- CDP method to use
-        cdp_params -- dict of required and optional CDP params (default: None)
+        cdp_arb -- JSON request with %d in place of the request ID
         time -- timeout in seconds (default: None)
         """
         self._logger.info('Method with(out) parameter(s) constructed')
-        self._logger.debug(f'ws_url: {ws_url}, cdp_method: {cdp_method}, ' +
-                           f'cdp_params: {bool(cdp_params)}, timeout: {time}')
+        self._logger.debug('ws_url: %s, cdp_arb: %s, timeout: %s', ws_url, cdp_arb, time)
         if not time:
             time = self._default_time
         try:
-            async_resp = await asyncio.wait_for(self._cdp_ws_arb(ws_url, cdp_method, cdp_params), timeout=time)
+            async_resp = await asyncio.wait_for(self._cdp_ws_arb(ws_url, cdp_arb), timeout=time)
             return async_resp
 
         except asyncio.TimeoutError:
-            self._logger.error(f"Timeout occured against {ws_url}")
+            self._logger.error("Timeout occured against %s", ws_url)
             return None
         except Exception as e:
-            self._logger.error(f"Error occured: {e}")
+            self._logger.error("Error occured: %s", e)
             return None
 
-    async def _sleep_await(self, time:int = None) -> None:
-        """Helper function to sleep execution on given CI:
+    async def _exec_cdp_batch_async(self, ws_url: str,
+                                    calls: list[tuple[str, dict]],
+                                    time: int = None) -> list[dict]:
+        """Return list of results of executing CDP methods
+        over one websocket, in order of calls
 
         Keyword arguments:
-        time -- timeout in seconds (default: None)
+        ws_url -- websocket URL
+        calls -- list of tuples of (CDP method, dict of CDP params or None)
+        time -- timeout in seconds for the whole batch (default: None)
+        """
+        if not time:
+            time = self._default_time
+        try:
+            responses = await asyncio.wait_for(self._cdp_ws_arb_batch(ws_url, calls), timeout=time)
+        except asyncio.TimeoutError:
+            self._logger.error("Timeout occured against %s", ws_url)
+            return None
+        except Exception as e:
+            self._logger.error("Error occured: %s", e)
+            return None
+        if responses is None:
+            return None
+        return [self._get_result(response) for response in responses]
+
+    async def _exec_cdp_batches_async(self, calls: list[tuple[str, str, dict]],
+                                      time: int = None) -> list[dict]:
+        """Return list of results of executing CDP methods against
+        their ws_urls, in order of calls. Calls are batched per ws_url
+        and the batches run concurrently
+
+        Keyword arguments:
+        calls -- list of tuples of (ws_url, CDP method, dict of CDP params or None)
+        time -- timeout in seconds for each ws_url's batch (default: None)
+        """
+        # Group calls by ws_url, remembering where each result goes
+        grouped = {}
+        for index, (ws_url, cdp_method, cdp_params) in enumerate(calls):
+            grouped.setdefault(ws_url, []).append((index, (cdp_method, cdp_params)))
+        batch_results = await asyncio.gather(
+            *(self._exec_cdp_batch_async(ws_url, [call for __, call in group], time)
+              for ws_url, group in grouped.items()))
+        results = [None] * len(calls)
+        for group, group_results in zip(grouped.values(), batch_results):
+            # Whole batch failed, its results stay None
+            if group_results is None:
+                continue
+            for (index, __), result in zip(group, group_results):
+                results[index] = result
+        return results
+
+    def _sleep(self, time: int = None) -> None:
+        """Helper function to sleep execution on given CI.
+        Blocks, there's nothing running on the event loop in between CDP executions
+
+        Keyword arguments:
+        time -- sleep time in seconds (default: None)
         """
         if not time:
             time = self._default_sleep_time
+        if not time:
+            return
         self._logger.info('Sleeping')
-        self._logger.debug(f"Sleeping for {time} sec(s)")
-        await asyncio.sleep(time)
+        self._logger.debug("Sleeping for %s sec(s)", time)
+        sleep(time)
 
-    async def _sleep(self, time: int = None) -> None:
-        """Wrapper function to sleep execution on given CI
+    def _sized_result(self, ws_response: dict) -> dict:
+        """Return result of ws_response, logging its size
 
         Keyword arguments:
-        time -- timeout in seconds (default: None)
+        ws_response -- dict of CDP websocket response
         """
-        await self._sleep_await(time=time)
+        result = self._get_result(ws_response)
+        # Only worth measuring if someone will see it.
+        # getsizeof only measures the top level dict, walking
+        # the whole result is only done for DEBUG
+        if self._logger.isEnabledFor(logging.DEBUG):
+            result_size = _deep_getsizeof(result)
+            self._logger.info("Response size of %d bytes", result_size)
+            if result_size > 1024:
+                self._logger.warning("Response greater than 1kb")
+        elif self._logger.isEnabledFor(logging.INFO):
+            result_size = sys.getsizeof(result)
+            self._logger.info("Response size of %d bytes (top level only)", result_size)
+            if result_size > 1024:
+                self._logger.warning("Response greater than 1kb")
+        return result
 
-    def _exec_cdp_params(self, ws_url: str,
-                        cdp_method: str,
-                        cdp_params: dict,
-                        time: int) -> dict:
-        """Return result of executing correct _cdp_ws_arb_timeout
-        based on cdp_params or not
+    async def _exec_cdp_noparams_async(self, ws_url: str,
+                                       cdp_method: str,
+                                       time: int) -> dict:
+        """Return result of executing CDP method without cdp_params.
+        Does not start an event loop, so many of these can be gathered concurrently
+
+        Keyword arguments:
+        ws_url -- websocket URL
+        cdp_method -- CDP method to use
+        time -- timeout in seconds
+        """
+        self._logger.info("No cdp_params. Running without arguments")
+        cdp_arb = InjectorCommands.paramless_template(cdp_method)
+        ws_response = await self._cdp_ws_arb_timeout(ws_url, cdp_arb, time=time)
+        return self._sized_result(ws_response)
+
+    async def _exec_cdp_withparams_async(self, ws_url: str,
+                                         cdp_method: str,
+                                         cdp_params: dict,
+                                         time: int) -> dict:
+        """Return result of executing CDP method with cdp_params, which
+        must already be a dict. Does not start an event loop,
+        so many of these can be gathered concurrently
 
         Keyword arguments:
         ws_url -- websocket URL
@@ -447,23 +1063,23 @@ class ChromeInjector:
         cdp_params -- dict of required and optional CDP params
         time -- timeout in seconds
         """
-        if cdp_params:
-            if type(cdp_params) is not dict:
-                self._logger.error(f"cdp_params is not a dict. Returning None")
-                return None
-            self._logger.info('Executing')
-            self._logger.debug(f"Executing with parameters: {cdp_params}")
-            ws_response = asyncio.run(self._cdp_ws_arb_timeout(ws_url, cdp_method, cdp_params, time=time))
-        else:
-            self._logger.info("No cdp_params. Running without arguments")
-            ws_response = asyncio.run(self._cdp_ws_arb_timeout(ws_url, cdp_method,time=time))
+        self._logger.info('Executing')
+        self._logger.debug("Executing with parameters: %s", cdp_params)
+        cdp_arb = InjectorCommands.params_template(cdp_method, cdp_params)
+        ws_response = await self._cdp_ws_arb_timeout(ws_url, cdp_arb, time=time)
+        return self._sized_result(ws_response)
 
-        result = self._get_result(ws_response)
-        result_size = sys.getsizeof(result)
-        self._logger.info(f"Response size of {result_size} bytes")
-        if result_size > 1024:
-            self._logger.warning("Response greater than 1mb")
-        return result
+    def _exec_cdp_noparams(self, ws_url: str,
+                           cdp_method: str,
+                           time: int) -> dict:
+        """Return result of executing CDP method without cdp_params
+
+        Keyword arguments:
+        ws_url -- websocket URL
+        cdp_method -- CDP method to use
+        time -- timeout in seconds
+        """
+        return self._loop.run_until_complete(self._exec_cdp_noparams_async(ws_url, cdp_method, time))
 
     def generate_ws_url(self, targetID: str) -> str:
         """Generate wss:// or ws:// url badsed on _wss
@@ -477,29 +1093,54 @@ class ChromeInjector:
                   targetID)
         return ws_url
 
+    async def _find_visible_tab(self, pages: list[tuple[dict, str]]) -> dict:
+        """Return first tab reporting itself as visible. Probes every
+        page concurrently and cancels the outstanding probes once found
+
+        Keyword arguments:
+        pages -- list of tuples of (tab dict, tab ws_url)
+        """
+        async def probe(tab: dict, tab_ws_url: str) -> tuple[dict, dict]:
+            result = await self._exec_cdp_withparams_async(tab_ws_url, "Runtime.evaluate",
+                                                           {'expression':'document.visibilityState'}, None)
+            return tab, result
+
+        tasks = [asyncio.create_task(probe(tab, tab_ws_url)) for tab, tab_ws_url in pages]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                tab, result = await next_done
+                self._logger.debug("Result is: %s", result)
+                if result and result.get('result', {}).get('value') == 'visible':
+                    self._logger.info("Found focused tab")
+                    return tab
+        finally:
+            # Nothing left to learn from the other tabs. Wait for them
+            # to finish cancelling, so none are left pending on the loop
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return None
+
     def get_current_tab(self) -> dict:
         """Return dict of current tab"""
         self._logger.info("Attempting to identify current tab")
         current_tab = None
         self._enum_windows()
         open_windows = self._open_windows
-        self._logger.debug(f"Open windows:\n{open_windows}")
+        self._logger.debug("Open windows:\n%s", open_windows)
         if open_windows:
             self._logger.info("Executing JS on potentially every open page to " +
                               "enumerate focused tab/window")
+            pages = []
             for tab in open_windows:
                 tab_url, tab_ws_url = self._get_url_ws_url(tab)
-                self._logger.debug(f"Tab ws: {tab_ws_url}")
+                self._logger.debug("Tab ws: %s", tab_ws_url)
                 if tab['type'] == 'page':
-                    result = self._exec_cdp_params(tab_ws_url, "Runtime.evaluate",
-                                                  {'expression':'document.visibilityState'}, None)
-                    self._logger.debug(f"Result is: {result}")
-                    if result['result']['value'] == 'visible':
-                        self._logger.info("Found focused tab")
-                        current_tab = tab
-                        break
+                    pages.append((tab, tab_ws_url))
                 else:
-                    self._logger.error(f"Skipping tab ws: {tab_ws_url}, of type: {tab['type']}")
+                    self._logger.error("Skipping tab ws: %s, of type: %s", tab_ws_url, tab['type'])
+            if pages:
+                current_tab = self._loop.run_until_complete(self._find_visible_tab(pages))
             if current_tab is None:
                 self._logger.warning('Active tab not identified. Returning None')
                 return current_tab
@@ -507,9 +1148,30 @@ class ChromeInjector:
             self._logger.warning('No open tabs. Returning None')
             return current_tab
         self._logger.info("ID'd current tab")
-        self._logger.debug(f"Current tab is: {current_tab}")
+        self._logger.debug("Current tab is: %s", current_tab)
         return current_tab
 
+    def _exec_cdp_params_focused(self, ws_url: str,
+                                 cdp_method: str,
+                                 cdp_params: dict,
+                                 time: int) -> dict:
+        """Return result of switching ws_url tab into focus then
+        executing CDP method on it. Both are sent in one batch,
+        so the tab is focused without waiting on a round trip
+
+        Keyword arguments:
+        ws_url -- websocket URL
+        cdp_method -- CDP method to use
+        cdp_params -- dict of required and optional CDP params
+        time -- timeout in seconds
+        """
+        calls = [("Page.bringToFront", None), (cdp_method, cdp_params)]
+        results = self._loop.run_until_complete(self._exec_cdp_batch_async(ws_url, calls, time))
+        if results is None:
+            return None
+        self._logger.info("Switched to target tab %s", ws_url)
+        return results[1]
+
     def switch_tabs(self, ws_url: str,
                     time: int = None) -> None:
         """Switch to target ws_url tab into focus
@@ -517,19 +1179,28 @@ class ChromeInjector:
         Keyword arguments:
         ws_url -- websocket URL
         time -- timeout in seconds (default: None)"""
-        self._exec_cdp_params(ws_url, "Page.bringToFront", None, time)
-        self._logger.info(f"Switched to target tab {ws_url}")
+        self._exec_cdp_noparams(ws_url, "Page.bringToFront", time)
+        self._logger.info("Switched to target tab %s", ws_url)
+
+    def refresh_windows(self) -> list[dict]:
+        """Re-enumerate and return list of open windows,
+        even if they were recently enumerated
+        """
+        self._invalidate_windows()
+        self._enum_windows()
+        return self._open_windows
 
     def get_windows_list(self) -> dict:
-        """Return list of open windows."""
+        """Return list of open windows. Reuses windows
+        enumerated within the open windows TTL"""
         self._enum_windows()
         return self._open_windows
 
-    def get_target_windows(self, regex: re.Pattern) -> dict:
+    def get_target_windows(self, regex: re.Pattern|str) -> dict:
         """Return list of target windows.
 
         Keyword Arguments:
-        regex: Compiled regex pattern for target URLs
+        regex: Compiled regex pattern, or pattern string, for target URLs
         """
         target_windows = self._enum_targets(regex)
         return target_windows
@@ -570,6 +1241,21 @@ class ChromeInjector:
             return
         self._default_sleep_time = new_value
 
+    def get_default_open_windows_ttl(self) -> float:
+        """Return period in seconds enumerated windows are reused for"""
+        return self._open_windows_ttl
+
+    def set_default_open_windows_ttl(self, new_value: float) -> None:
+        """Set period in seconds enumerated windows are reused for.
+        0 re-enumerates every time
+
+        Keyword arguments:
+        new_value -- new period in seconds"""
+        if type(new_value) not in (int, float) or new_value < 0:
+            self._logger.error("New default value must be a number >= 0")
+            return
+        self._open_windows_ttl = new_value
+
     def get_default_max_response_size(self) -> int:
         """Return default max response size in mb"""
         return self._default_max_response_size
@@ -586,7 +1272,7 @@ class ChromeInjector:
 
     def cdp_method_exec(self, cdp_method: str,
                         cdp_params: dict = None,
-                        regex: re.Pattern = None,
+                        regex: re.Pattern|str = None,
                         first_window: bool = False,
                         first_target: bool = False,
                         time: int = None,
@@ -600,7 +1286,7 @@ class ChromeInjector:
 
         Keyword arguments:
         cdp_params -- json dict e.g. {"expression":"alert(1);"} (default None)
-        regex -- regex to create targets list form open windows (default '.*')
+        regex -- regex, compiled or pattern string, to create targets list form open windows (default '.*')
         first_window -- flag to only execute on first tab in window dict (default False)
         first_target -- flag to only execute on first target tab (default False)
         time -- timeout for execution (default DEFAULT_TIME)
@@ -608,9 +1294,18 @@ class ChromeInjector:
         associate_ws_url -- perform extra enumeration of open tabs to associate ws_url with original tab (default False)
         tab_focus -- flag to put tab in focus before executing CDP method (default False)
         tab_focus_back -- flag to return focus back to original tab after focus switch (default True)
-        enum_windows -- flag to (re-)enumerate windows or not (default True)
+        enum_windows -- flag to (re-)enumerate windows or not, windows enumerated
+                        within the open windows TTL are reused (default True)
         browser_debug_ws -- flag or string of browser debug WS (default False)
         """
+        # Check before any enumeration is done for a bad regex or cdp_params.
+        # Nothing below cdp_method_exec checks cdp_params again
+        if regex is not None and not isinstance(regex, (re.Pattern, str)):
+            self._logger.error("regex must be of type re.Pattern, str or None not %s", type(regex))
+            return None
+        if cdp_params is not None and type(cdp_params) is not dict:
+            self._logger.error("cdp_params is not a dict. Returning None")
+            return None
         url_result_ws_url = []
         target_windows = []
         original_tab_ws_url = None
@@ -625,27 +1320,25 @@ class ChromeInjector:
             return None
         elif (type(browser_debug_ws) is bool) and browser_debug_ws:
             self._logger.info("Executing against browser debug WS")
-            if self._browser_ws:
-                ws_url = self._browser_ws
-            else:
-                self._logger.warning("Browser Debug WS not set, attempting" +
-                                     " to enumerate")
-                self.set_browser_ws()
-                if self._browser_ws:
-                    ws_url = self._browser_ws
-                else:
-                    self._logger.error("Could not enumerate browser WS")
-                    return None
+            ws_url = self._ensure_browser_ws()
+            if not ws_url:
+                return None
         elif (type(browser_debug_ws) is str):
             if "devtools/browser" not in browser_debug_ws:
                 self._logger.error("browser_debug_ws is not a browser debug WS")
                 return None
             else:
                 self._logger.info("Using provided browser debug WS")
-                self._logger.debug(f"Provided browser debug WS: {browser_debug_ws}")
+                self._logger.debug("Provided browser debug WS: %s", browser_debug_ws)
                 ws_url = browser_debug_ws
         if not time:
             time = self._default_time
+        # Pick execution with or without cdp_params once,
+        # instead of checking cdp_params per target
+        if cdp_params:
+            exec_cdp_async = partial(self._exec_cdp_withparams_async, cdp_params=cdp_params)
+        else:
+            exec_cdp_async = self._exec_cdp_noparams_async
         # Either need to iterate over all target windows (after enum)
         # or use explicit ws_url, not both
         if (first_target or first_window or regex) and ws_url:
@@ -664,9 +1357,10 @@ class ChromeInjector:
         if ws_url:
             self._logger.info("Executing against explicit ws_url")
             if tab_focus:
-                self.switch_tabs(ws_url)
+                result = self._exec_cdp_params_focused(ws_url, cdp_method, cdp_params, time)
                 switch_occured = True
-            result = self._exec_cdp_params(ws_url, cdp_method, cdp_params, time)
+            else:
+                result = self._loop.run_until_complete(exec_cdp_async(ws_url, cdp_method, time=time))
             # Should probably get url to print
             url = ws_url
             if (associate_ws_url):
@@ -675,7 +1369,7 @@ class ChromeInjector:
                 # Set url to actual url if ws_url is associated with an open window
                 # Else just use ws_url as url value
                 if open_windows:
-                    self._logger.info(f"Looking for original tab to associate with ws_url: {ws_url}")
+                    self._logger.info("Looking for original tab to associate with ws_url: %s", ws_url)
                     for tab in open_windows:
                         tab_url, tab_ws_url = self._get_url_ws_url(tab)
                         #self._logger.debug(f"tab_url:{tab_url} tab_ws_url:{tab_ws_url}")
@@ -687,14 +1381,11 @@ class ChromeInjector:
         # Else we need to pick targets using regex for URL
         # Requires enumeration of tabs
         else:
-            if not (type(regex) is re.Pattern or regex is None):
-                self._logger.error(f"regex must be of type re.Pattern or None not {type(regex)}")
-                return None
             if enum_windows:
-                self._logger.info("enum_windows is True: Enumerating open tabs")
+                self._logger.info("enum_windows is True: Enumerating open tabs (unless within TTL)")
                 self._enum_windows()
             if not regex:
-                regex = re.compile('.*')
+                regex = _MATCH_ALL
                 self._logger.warning("regex set to '.*'")
             # If we only want to to execute on the first tab
             # set target tabs just to the first tab of _open_windows regardless of targets
@@ -718,25 +1409,88 @@ class ChromeInjector:
                     self._logger.error("No target windows. Returning None")
                     return None
 
-            # Iterate over target windows and perform the CDP method
-            windows_left = len(target_windows)
-            for window in target_windows:
-                windows_left -= 1
-                url, ws_url = self._get_url_ws_url(window)
-                self._logger.info(f"Executing '{cdp_method}' against '{url}', {ws_url}")
-                if tab_focus:
-                   self.switch_tabs(ws_url)
-                   switch_occured = True
-                result = self._exec_cdp_params(ws_url, cdp_method, cdp_params, time)
-                url_result_ws_url.append((url, result, ws_url))
-                if windows_left > 0:
-                    asyncio.run(self._sleep())
+            # Resolve (url, ws_url) of every target once, up front,
+            # so the loops below only dispatch CDP executions
+            targets = [self._get_url_ws_url(window) for window in target_windows]
+            if tab_focus:
+                # Focus is global to the browser, so tabs
+                # have to be switched to and executed on one by one
+                windows_left = len(targets)
+                for url, ws_url in targets:
+                    windows_left -= 1
+                    self._logger.info("Executing '%s' against '%s', %s", cdp_method, url, ws_url)
+                    result = self._exec_cdp_params_focused(ws_url, cdp_method, cdp_params, time)
+                    switch_occured = True
+                    url_result_ws_url.append((url, result, ws_url))
+                    if windows_left > 0:
+                        self._sleep()
+            else:
+                # Tabs are independent of each other, so send the
+                # CDP method to all target windows concurrently.
+                # No sleeping between tabs, they overlap instead
+                async def _run_one(url: str, ws_url: str) -> tuple[str, dict, str]:
+                    self._logger.info("Executing '%s' against '%s', %s", cdp_method, url, ws_url)
+                    result = await exec_cdp_async(ws_url, cdp_method, time=time)
+                    return url, result, ws_url
+
+                async def _run_all() -> list[tuple[str, dict, str]]:
+                    return await asyncio.gather(*(_run_one(url, ws_url) for url, ws_url in targets))
+
+                url_result_ws_url.extend(self._loop.run_until_complete(_run_all()))
 
         if switch_occured and tab_focus_back:
             self._logger.info("Switching back to original tab")
             self.switch_tabs(original_tab_ws_url)
         return url_result_ws_url
 
+    def cdp_method_exec_many(self, calls: list[tuple[str, dict]],
+                             ws_url: str,
+                             time: int = None) -> list[dict]:
+        """Execute several CDP methods against one tab over a single
+        websocket and return list of results, in order of calls.
+        Requests are sent back-to-back without waiting on responses
+
+        Keyword arguments:
+        calls -- list of tuples of (CDP method, dict of CDP params or None)
+        ws_url -- websocket URL of target
+        time -- timeout in seconds for the whole batch (default DEFAULT_TIME)
+        """
+        if not calls:
+            self._logger.error("No calls provided. Returning None")
+            return None
+        if not ws_url:
+            self._logger.error("ws_url not set. Returning None")
+            return None
+        for cdp_method, cdp_params in calls:
+            if cdp_params is not None and type(cdp_params) is not dict:
+                self._logger.error("cdp_params for '%s' is not a dict. Returning None", cdp_method)
+                return None
+        self._logger.info("Executing %s CDP method(s) against %s", len(calls), ws_url)
+        return self._loop.run_until_complete(self._exec_cdp_batch_async(ws_url, calls, time))
+
+    def cdp_exec_batch(self, calls: list[tuple[str, str, dict]],
+                       time: int = None) -> list[dict]:
+        """Execute CDP methods against any number of tabs and return
+        list of results, in order of calls. Calls for the same ws_url share
+        one websocket, and different ws_urls are executed against concurrently
+
+        Keyword arguments:
+        calls -- list of tuples of (ws_url, CDP method, dict of CDP params or None)
+        time -- timeout in seconds for each ws_url's batch (default DEFAULT_TIME)
+        """
+        if not calls:
+            self._logger.error("No calls provided. Returning None")
+            return None
+        for ws_url, cdp_method, cdp_params in calls:
+            if not ws_url:
+                self._logger.error("ws_url for '%s' not set. Returning None", cdp_method)
+                return None
+            if cdp_params is not None and type(cdp_params) is not dict:
+                self._logger.error("cdp_params for '%s' is not a dict. Returning None", cdp_method)
+                return None
+        self._logger.info("Executing %s CDP method(s)", len(calls))
+        return self._loop.run_until_complete(self._exec_cdp_batches_async(calls, time))
+
     def cdp_eval_script(self, script: str,
                         regex: re.Pattern = None,
                         first_target: bool = False,
@@ -762,9 +1516,8 @@ class ChromeInjector:
         if not script:
             self._logger.error("Script not set")
             return url_result_ws_url
-        command, *__ = InjectorCommands.get_command("js_exec")
         arguments = {"expression": script, "returnByValue": returnBV, "silent": silent}
-        url_result_ws_url = self.cdp_method_exec(command, arguments, regex, first_target=first_target, time=time, ws_url=ws_url)
+        url_result_ws_url = self.cdp_method_exec(_CMD_JS_EXEC, arguments, regex, first_target=first_target, time=time, ws_url=ws_url)
         return url_result_ws_url
 
     def cdp_get_open_tab_cookies(self, regex: re.Pattern = None,
@@ -779,22 +1532,14 @@ class ChromeInjector:
         time -- timeout in seconds (default: None)
         ws_url -- websocket URL (default: None)
         """
-        list_url_cookies_ws_url = []
-        command, *__ = InjectorCommands.get_command("tab_cookies")
-        results = self.cdp_method_exec(command, None, regex,
+        results = self.cdp_method_exec(_CMD_TAB_COOKIES, None, regex,
                                        first_target=first_target,
                                        time=time, ws_url=ws_url)
         # Return None if results are None
         if not results:
             return None
-        for url, result, tab_ws_url in results:
-            if not result:
-                cookies = None
-                self._logger.error(f"'{url}' result was None")
-            else:
-                cookies = result.get("cookies")
-            list_url_cookies_ws_url.append((url, cookies, tab_ws_url))
-        return list_url_cookies_ws_url
+        return [(url, result.get("cookies") if result else self._log_none(url), tab_ws_url)
+                for url, result, tab_ws_url in results]
 
     def cdp_get_all_cookies(self, time:  int = None) -> dict:
         """Return all cookies as dict:
@@ -802,8 +1547,7 @@ class ChromeInjector:
         Keyword arguments:
         time -- timeout in seconds
         """
-        command, *__ = InjectorCommands.get_command("all_cookies")
-        results = self.cdp_method_exec(command,browser_debug_ws=True, time=time)
+        results = self.cdp_method_exec(_CMD_ALL_COOKIES,browser_debug_ws=True, time=time)
         if not results:
             self._logger.error("No cookies, returning None")
             return None
@@ -822,10 +1566,9 @@ class ChromeInjector:
         if params is None:
             self._logger.error("No domain specified")
             return None
-        command, *__ = InjectorCommands.get_command("get_domain_cookies")
         validated_params = InjectorCommands.create_validated_params("get_domain_cookies", params)
         if validated_params:
-            results = self.cdp_method_exec(command, validated_params, first_window=True, time=time)
+            results = self.cdp_method_exec(_CMD_GET_DOMAIN_COOKIES, validated_params, first_window=True, time=time)
         else:
             self._logger.error("Incorrect parameters provided. Returning None")
             return None
@@ -852,37 +1595,42 @@ class ChromeInjector:
         quality -- 0 - 100 quality (default: None)
         tab_focus_back -- flag to return focus back to original tab after focus switch (default False)
         """
-        url_screenshot_ws_url = []
-        command, *__ = InjectorCommands.get_command("capture_screenshot")
         if quality:
-            self._logger.info(f"Sending screenshot request with quality of {quality}")
+            self._logger.info("Sending screenshot request with quality of %s", quality)
             if type(quality) is not int or not (quality >= 0 and quality <= 100):
                 self._logger.error("quality must be an int >=0 and <=100")
                 return None
             params = {"format":"jpeg","quality":quality}
-            results = self.cdp_method_exec(command, cdp_params=params, regex=regex, first_target=first_target,
+            results = self.cdp_method_exec(_CMD_CAPTURE_SCREENSHOT, cdp_params=params, regex=regex, first_target=first_target,
                                           time=time, tab_focus=True, ws_url=ws_url,
                                           tab_focus_back=tab_focus_back)
         else:
-            results = self.cdp_method_exec(command, cdp_params=None, regex=regex, first_target=first_target,
+            results = self.cdp_method_exec(_CMD_CAPTURE_SCREENSHOT, cdp_params=None, regex=regex, first_target=first_target,
                                           time=time, tab_focus=True, ws_url=ws_url,
                                           tab_focus_back=tab_focus_back)
         if not results:
             return None
-        for url, result, tab_ws_url in results:
-            if not result:
-                data = None
-                self._logger.error(f"'{url}' result was None")
-            else:
-                data = result.get("data")
-            url_screenshot_ws_url.append((url, data, tab_ws_url))
-        return url_screenshot_ws_url
+        return [(url, result.get("data") if result else self._log_none(url), tab_ws_url)
+                for url, result, tab_ws_url in results]
 
     def cdp_get_open_tabs(self) -> dict:
-        """Return list of tab dicts"""
+        """Return list of tab dicts, always freshly enumerated"""
         self._logger.info("Enumerating open tabs")
-        self._enum_windows()
-        return self._open_windows
+        return self.refresh_windows()
+
+    def cdp_browser_batch(self, ops: list[tuple[str, dict]],
+                          time: int = None) -> list[dict]:
+        """Execute several CDP methods against the browser debug WS
+        over a single websocket and return list of results, in order of ops
+
+        Keyword arguments:
+        ops -- list of tuples of (CDP method, dict of CDP params or None)
+        time -- timeout in seconds for the whole batch (default: None)
+        """
+        browser_ws = self._ensure_browser_ws()
+        if not browser_ws:
+            return None
+        return self.cdp_method_exec_many(ops, ws_url=browser_ws, time=time)
 
     def cdp_new_window(self, url: str,
                        background: bool = False,
@@ -896,44 +1644,92 @@ class ChromeInjector:
         new_window -- flag to open new tab in new window (default: False)
         for_tab -- flag to create the target of type "tab", EXPERIMENTAL (default: False)
         """
+        results = self.cdp_new_windows([url], background=background,
+                                       new_window=new_window, for_tab=for_tab)
+        if not results:
+            return None
+        return results[0]
+
+    def cdp_new_windows(self, urls: list[str],
+                        background: bool = False,
+                        new_window: bool = False,
+                        for_tab: bool = False) -> list[tuple[str, str]]:
+        """Return list of tuples of ws_url and targetID, in order of urls,
+        opening all new windows/tabs in one batch.
+        Tuple is None if opening that window/tab failed
+
+        Keyword arguments:
+        urls -- list of new target window urls, include http(s)://
+        background -- flag to background new windows (default: False)
+        new_window -- flag to open new tabs in new windows (default: False)
+        for_tab -- flag to create the targets of type "tab", EXPERIMENTAL (default: False)
+        """
+        if not urls:
+            self._logger.error("No urls provided. Returning None")
+            return None
         if background and new_window:
             self._logger.warning("Using background and new_window together " +
                           "may not work as expected. May pop up new " +
                           "window in view of user")
-        self._logger.info(f"Opening new {'window' if new_window else 'tab'}")
+        self._logger.info("Opening %d new %s", len(urls), 'window(s)' if new_window else 'tab(s)')
         if for_tab:
             # Warning for Chrome Versions 120.0.6099.218+
             self._logger.warning("As of Chrome 120.0.6099.218 "+
                                  "Target.createTarget with forTab "+
                                  "returns incorrect "+
                                  "target ID. Check with cdp_get_open_tabs")
-        command, *__ = InjectorCommands.get_command("new_window")
-        if not url:
-            url = 'chrome://newtab'
-        params = {"url":url, "background":background,
-                  "newWindow":new_window, "forTab": for_tab}
-        validated_params = InjectorCommands.create_validated_params("new_window", params)
-        if validated_params:
-            result = self.cdp_method_exec(command, validated_params, browser_debug_ws=True)
-        else:
-            self._logger.error("Incorrect parameters provided. Returning None")
+        ops = []
+        for url in urls:
+            if not url:
+                url = 'chrome://newtab'
+            params = {"url":url, "background":background,
+                      "newWindow":new_window, "forTab": for_tab}
+            validated_params = InjectorCommands.create_validated_params("new_window", params)
+            if not validated_params:
+                self._logger.error("Incorrect parameters provided. Returning None")
+                return None
+            ops.append((_CMD_NEW_WINDOW, validated_params))
+        results = self.cdp_browser_batch(ops)
+        self._invalidate_windows()
+        if results is None:
             return None
-        targetID = result[0][1].get("targetId")
-        ws_url = self.generate_ws_url(targetID)
-        return ws_url, targetID
+        ws_url_target_ids = []
+        for result in results:
+            if not result:
+                ws_url_target_ids.append(None)
+                continue
+            targetID = result.get("targetId")
+            ws_url_target_ids.append((self.generate_ws_url(targetID), targetID))
+        return ws_url_target_ids
 
     def cdp_close_window(self, targetID: str) -> bool:
         """Return True if tab succesfully closed"""
-        command, *__ = InjectorCommands.get_command("close_window")
-        params = {"targetId":targetID}
-        validated_params = InjectorCommands.create_validated_params("close_window", params)
-        if validated_params:
-            result = self.cdp_method_exec(command, validated_params, browser_debug_ws=True)
-        else:
-            self._logger.error("Incorrect parameters provided. Returning None")
-            return False
-        return_bool = True if result[0][1] is not None else False
-        return return_bool
+        results = self.cdp_close_windows([targetID])
+        return bool(results and results[0])
+
+    def cdp_close_windows(self, targetIDs: list[str]) -> list[bool]:
+        """Return list of bools, in order of targetIDs, True if tab
+        succesfully closed. Closes all tabs in one batch
+
+        Keyword arguments:
+        targetIDs -- list of TargetIDs of tabs to close
+        """
+        if not targetIDs:
+            self._logger.error("No targetIDs provided. Returning None")
+            return None
+        ops = []
+        for targetID in targetIDs:
+            params = {"targetId":targetID}
+            validated_params = InjectorCommands.create_validated_params("close_window", params)
+            if not validated_params:
+                self._logger.error("Incorrect parameters provided. Returning None")
+                return None
+            ops.append((_CMD_CLOSE_WINDOW, validated_params))
+        results = self.cdp_browser_batch(ops)
+        self._invalidate_windows()
+        if results is None:
+            return [False] * len(targetIDs)
+        return [result is not None for result in results]
 
     def cdp_get_tab_history(self, regex: re.Pattern = None,
                             first_target: bool =  False,
@@ -947,19 +1743,10 @@ class ChromeInjector:
         time -- timeout for execution (default None)
         ws_url -- ws_url of known target, cannot be used with regex (default None)
         """
-
-        url_history_ws_url = []
-        command, *__ = InjectorCommands.get_command("get_tab_history")
-        results = self.cdp_method_exec(command,cdp_params=None, regex=regex, first_target=first_target,
+        results = self.cdp_method_exec(_CMD_GET_TAB_HISTORY,cdp_params=None, regex=regex, first_target=first_target,
                                         time=time, ws_url=ws_url)
         if not results:
             return None
-        for url, result, tab_ws_url in results:
-            if not result:
-                data = None
-                self._logger.error(f"'{url}' result was None")
-            else:
-                data = result.get("entries")
-            url_history_ws_url.append((url, data, tab_ws_url))
-        return url_history_ws_url
+        return [(url, result.get("entries") if result else self._log_none(url), tab_ws_url)
+                for url, result, tab_ws_url in results]
 
@@ -1,17 +1,31 @@
 """ This module contains the InjectorCommands class.
-It is a helper class to manage the templates for
+It is a helper class to build the JSON requests for
 CDP command execution with(out) parameters. It is also used to hold
 the commands for commonly ran CDP methods like Network.getCookies. This is
 used by the ChromeInjector instance method get_open_tab_cookies() method
 which retrieves the CDP command from InjectorCommands.get_command("tab_cookies")
 """
 import sys
-from string import Template
+import json
+import functools
 import logging
 
+# Use orjson for serializing CDP requests if it's installed
+try:
+    import orjson
+
+    def _dumps(obj: dict) -> str:
+        """Return obj serialized as JSON string"""
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _dumps = json.dumps
+
 
 class InjectorCommands:
-    """A helper class to manage command templates and commonly used CDP commands"""
+    """A helper class to build CDP requests and manage commonly used CDP commands"""
+
+    # Logger, looked up once instead of on every call
+    _log = logging.getLogger(__name__)
 
 
     # Pre-written CDP commands
@@ -34,17 +48,6 @@ class InjectorCommands:
                             "Close target window by TargetID (last part of ws_url)")
     _GET_TAB_HISTORY    = ("Page.getNavigationHistory", None, "Get navigation history per tab")
 
-    # Template commands for executing CDP commands
-    # Syntax is (Template, description)
-    _CDP_EXEC = (
-        Template("{\"id\": $id, \"method\": \"$method\"}"),
-        "Template to execute arbitrary CDP method without arguments"
-    )
-    _CDP_EXEC_PARAMS = (
-        Template("{\"id\": $id, \"method\": \"$method\", \"params\": $params}"),
-        "Template to execute arbitrary CDP method with arguments"
-    )
-
     _commands = {
         'tab_cookies'       : _GET_TAB_COOKIES,
         'all_cookies'       : _GET_ALL_COOKIES,
@@ -56,19 +59,28 @@ class InjectorCommands:
         'get_tab_history'   : _GET_TAB_HISTORY
     }
 
-    _template_commands = {
-        'cdp_exec'          : _CDP_EXEC,
-        'cdp_exec_params'   : _CDP_EXEC_PARAMS
-    }
+    # Set of parameter names per command, computed once
+    # for create_validated_params
+    _param_sets = {name: frozenset(params) if params else frozenset()
+                   for name, (command, params, description) in _commands.items()}
+
+    # Pre-serialized requests for commands without parameters,
+    # keyed by method. Only the request ID is filled in per call
+    _PARAMLESS_PREFIX = {command: f'{{"id":%d,"method":{json.dumps(command)}}}'
+                         for command, params, description in _commands.values()
+                         if params is None}
 
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def get_command(cls, name: str) -> tuple[str,dict,str]:
-        """Takes a command name, returns command, arguments dict, and description"""
-        command, params, description = cls._commands.get(name)
+        """Takes a command name, returns command, arguments dict, and description.
+        Results are cached, _commands doesn't change at runtime
+        """
+        command = cls._commands.get(name)
         if command:
-            return command, params, description
+            return command
         else:
-            logging.getLogger(__name__).error(f"No such command:{name}")
+            cls._log.error("No such command:%s", name)
             return None
 
     @classmethod
@@ -85,14 +97,45 @@ class InjectorCommands:
         return commands_dict
 
     @classmethod
-    def get_command_template(cls, name: str) -> tuple[str, Template]:
-        """Takes a template name, returns template and description"""
-        template, description = cls._template_commands.get(name)
+    def build(cls, id: int, method: str, params: dict = None) -> str:
+        """Return JSON request to execute CDP method with(out) parameters.
+        Returned as str since CDP only accepts text WebSocket messages
+
+        Keyword arguments:
+        id -- WS request ID
+        method -- CDP method to use
+        params -- dict of required and optional CDP params (default: None)
+        """
+        if params is None:
+            prefix = cls._PARAMLESS_PREFIX.get(method)
+            if prefix:
+                return prefix % id
+            return _dumps({"id": id, "method": method})
+        return _dumps({"id": id, "method": method, "params": params})
+
+    @classmethod
+    def paramless_template(cls, method: str) -> str:
+        """Return JSON request to execute CDP method without parameters,
+        with %d in place of the request ID. Fill in with template % id
+
+        Keyword arguments:
+        method -- CDP method to use
+        """
+        template = cls._PARAMLESS_PREFIX.get(method)
         if template:
-            return template, description
-        else:
-            logging.getLogger(__name__).error(f"No such template:{template}")
-            return None
+            return template
+        return '{"id":%d,' + _dumps({"method": method})[1:].replace('%', '%%')
+
+    @classmethod
+    def params_template(cls, method: str, params: dict) -> str:
+        """Return JSON request to execute CDP method with parameters,
+        with %d in place of the request ID. Fill in with template % id
+
+        Keyword arguments:
+        method -- CDP method to use
+        params -- dict of required and optional CDP params
+        """
+        return '{"id":%d,' + _dumps({"method": method, "params": params})[1:].replace('%', '%%')
 
     @classmethod
     def get_req_params(cls, name: str) -> dict:
@@ -101,7 +144,7 @@ class InjectorCommands:
         if command:
             return params
         else:
-            logging.getLogger(__name__).error(f"No such command:{name}, Returning None")
+            cls._log.error("No such command:%s, Returning None", name)
             return None
 
     @classmethod
@@ -111,23 +154,25 @@ class InjectorCommands:
         If supplied_params is missing required keys
         from command_params returns None
         """
-        command, command_params_dict, *__ = cls.get_command(name)
-        if not command:
-            logging.getLogger(__name__).error(f"No such command:{name}. Returning None")
+        if name not in cls._param_sets:
+            cls._log.error("No such command:%s. Returning None", name)
             return None
 
         if type(supplied_params) is not dict:
-            logging.getLogger(__name__).error(f"Supplied parameters are not a dict. Returning None")
+            cls._log.error("Supplied parameters are not a dict. Returning None")
             return None
 
-        command_params = set(command_params_dict.keys())
-        if not all(key in command_params for key in supplied_params.keys()):
-            logging.getLogger(__name__).error("Not all parameters defined. Returning None")
-            logging.getLogger(__name__).debug(f"Require: {command_params}\nProvided:{supplied_params.keys()}")
+        command_params = cls._param_sets[name]
+        supplied = supplied_params.keys()
+        missing = command_params - supplied
+        if missing:
+            cls._log.error("Not all parameters defined. Returning None")
+            cls._log.debug("Require: %s\nProvided:%s\nMissing:%s", command_params, supplied, missing)
             return None
-        elif not all(key in supplied_params.keys() for key in command_params):
-            logging.getLogger(__name__).warning(f"All parameters accounted for, but provided extra. May experience unexpected behavior")
-            return supplied_params
+        extra = supplied - command_params
+        if extra:
+            cls._log.warning("All parameters accounted for, but provided extra. May experience unexpected behavior")
+            cls._log.debug("Extra:%s", extra)
         else:
-            logging.getLogger(__name__).debug(f"All parameters accounted for")
-            return supplied_params
\ No newline at end of file
+            cls._log.debug("All parameters accounted for")
+        return supplied_params